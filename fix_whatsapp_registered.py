@@ -12,23 +12,169 @@ License: MIT
 Version: 2.0.0
 """
 
+import argparse
+import errno
+import functools
 import json
 import logging
+import math
+import mmap
+import os
+import stat
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Optional, Tuple
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='[%(asctime)s] %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+from typing import Dict, NamedTuple, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ijson  # type: ignore[import-untyped, import-not-found]
+except ImportError:  # pragma: no cover - optional accelerator
+    ijson = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
 # Constants
 DEFAULT_CREDS_PATH = Path.home() / ".whatsappbot" / "credentials" / "whatsapp" / "default" / "creds.json"
+DEFAULT_SESSIONS_ROOT = DEFAULT_CREDS_PATH.parent.parent
+CREDS_FILENAME = "creds.json"
 BACKUP_SUFFIX = ".backup"
+TMP_SUFFIX = ".tmp"
+WRITE_BUFFER_SIZE = 1 << 20  # Large enough to hold typical creds.json files
+
+# orjson reads integers outside the 64-bit range as floats. Such an integer
+# needs at least 19 digits, so translating every digit to "0" and searching
+# for a run of them is a cheap C-level pre-check before walking the result.
+_DIGITS_TO_ZERO = bytes.maketrans(b"0123456789", b"0" * 10)
+_WIDE_INT_DIGITS = b"0" * 19
+
+# Bytes that can precede a null value in compact or indented JSON; a bare
+# b"null" also turns up inside base64 strings
+_NULL_VALUE_PRECEDERS = frozenset(b":,[ ")
+
+# Byte patterns for the registration flag as written by Baileys (compact)
+# and by save_credentials (indented)
+REGISTERED_KEY = b'"registered"'
+REGISTERED_TRUE_PATTERNS = (b'"registered":true', b'"registered": true')
+
+# Top-level keys needed to decide whether the registration flag needs fixing
+STATUS_KEYS = frozenset(("account", "me", "registered"))
+
+
+class RegistrationStatus(NamedTuple):
+    """Registration status indicators read from credentials."""
+    
+    has_account: bool
+    has_me: bool
+    registered: bool
+    needs_fix: bool
+
+
+class _NotRegularFileError(OSError):
+    """Raised when the credentials path exists but is not a regular file."""
+
+
+class _NotAnObjectError(ValueError):
+    """Raised when valid credentials JSON is not a top-level object."""
+
+
+@functools.lru_cache(maxsize=32)
+def _ensured_parent(path: Path) -> Path:
+    """Create the parent directory of path once per process and return it."""
+    parent = path.parent
+    parent.mkdir(parents=True, exist_ok=True)
+    return parent
+
+
+def _fsync_dir(path: Path) -> None:
+    """Flush directory entries (renames, links) in path to disk."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _has_null_value(data: bytes) -> bool:
+    """Check whether serialized JSON may contain a null value."""
+    pos = data.find(b"null")
+    while pos != -1:
+        if pos == 0 or data[pos - 1] in _NULL_VALUE_PRECEDERS:
+            return True
+        pos = data.find(b"null", pos + 4)
+    return False
+
+
+def _has_float(obj, predicate) -> bool:
+    """Check whether any float nested in obj satisfies predicate."""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is dict:
+            stack.extend(value.values())
+        elif kind is list:
+            stack.extend(value)
+        elif kind is float and predicate(value):
+            return True
+    return False
+
+
+def _is_wide_integral(value: float) -> bool:
+    """Check whether a float is an integer outside the 64-bit range."""
+    return value.is_integer() and abs(value) >= 2 ** 63
+
+
+def _is_non_finite(value: float) -> bool:
+    """Check whether a float is NaN or infinite."""
+    return not math.isfinite(value)
+
+
+def _json_loads(data: bytes) -> Dict:
+    """
+    Parse JSON bytes, using orjson when it can do so losslessly.
+    
+    Falls back to the stdlib for documents orjson rejects (NaN, Infinity)
+    or has read lossily (integers outside the 64-bit range become floats).
+    """
+    if orjson is None:
+        return json.loads(data)
+    try:
+        creds = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+    if (
+        _WIDE_INT_DIGITS in data.translate(_DIGITS_TO_ZERO)
+        and _has_float(creds, _is_wide_integral)
+    ):
+        return json.loads(data)
+    return creds
+
+
+def _json_dumps(obj: Dict, pretty: bool = False) -> bytes:
+    """
+    Serialize an object to JSON bytes, using orjson when it is lossless.
+    
+    orjson raises TypeError for integers wider than 64 bits and writes
+    NaN/Infinity as null; the stdlib serializer is used in both cases. The
+    float walk only runs when the output contains a null value at all.
+    """
+    if orjson is not None:
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except TypeError:
+            pass
+        else:
+            if not _has_null_value(data) or not _has_float(obj, _is_non_finite):
+                return data
+    if pretty:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(',', ':')).encode("utf-8")
 
 
 class CredentialManager:
@@ -42,7 +188,133 @@ class CredentialManager:
             creds_path: Path to credentials file. Uses default if not provided.
         """
         self.creds_path = creds_path or DEFAULT_CREDS_PATH
-        logger.info(f"Initialized CredentialManager with path: {self.creds_path}")
+        # (path, st_mtime_ns, st_size) -> (raw bytes, parsed credentials).
+        # The parsed dict is private to the instance and never handed out;
+        # it is None until first needed after a save or a load.
+        self._cache: Optional[Tuple[Tuple[str, int, int], bytes, Optional[Dict]]] = None
+        # Outcome of the last fix_registration_flag call: "none", "fixed" or "error"
+        self.last_action: Optional[str] = None
+        # Backup written by the last successful save, if any
+        self.last_backup: Optional[Path] = None
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Initialized CredentialManager with path: {self.creds_path}")
+    
+    def _read_parsed(self) -> Tuple[bytes, Dict]:
+        """
+        Read and parse the credentials file in a single pass.
+        
+        Returns:
+            Tuple of (raw file bytes, parsed credentials dictionary).
+        
+        Raises:
+            OSError: If the file cannot be read.
+            json.JSONDecodeError: If the file does not contain valid JSON.
+        """
+        raw = self.creds_path.read_bytes()
+        return raw, _json_loads(raw)
+    
+    def _stat(self) -> Optional[os.stat_result]:
+        """Stat the credentials path, returning None if it does not exist."""
+        try:
+            return os.stat(self.creds_path)
+        except FileNotFoundError:
+            return None
+    
+    def _regular_stat(self) -> os.stat_result:
+        """
+        Stat the credentials path and require it to be a regular file.
+        
+        Existence and file type are both derived from this one stat, so
+        callers need no separate exists()/is_file() checks.
+        
+        Raises:
+            FileNotFoundError: If the path does not exist.
+            _NotRegularFileError: If the path is a directory, FIFO, etc.
+        """
+        st = self._stat()
+        if st is None:
+            raise FileNotFoundError(
+                errno.ENOENT, os.strerror(errno.ENOENT), str(self.creds_path)
+            )
+        if not stat.S_ISREG(st.st_mode):
+            raise _NotRegularFileError(
+                errno.EISDIR, "Not a regular file", str(self.creds_path)
+            )
+        return st
+    
+    def _cache_key(self, st: Optional[os.stat_result] = None) -> Tuple[str, int, int]:
+        """Build the memoization key from the file's stat, taking one if needed."""
+        if st is None:
+            st = os.stat(self.creds_path)
+        return str(self.creds_path), st.st_mtime_ns, st.st_size
+    
+    def _load_cached(self, st: Optional[os.stat_result] = None) -> Tuple[bytes, Dict]:
+        """
+        Return the raw and parsed credentials, re-reading only on change.
+        
+        The cache is keyed on the file's path, mtime and size, so an
+        external rewrite of creds.json is picked up on the next call.
+        
+        Args:
+            st: Stat already taken by the caller via _regular_stat.
+        
+        Raises:
+            Same as _regular_stat and _read_parsed.
+        """
+        if st is None:
+            st = self._regular_stat()
+        key = self._cache_key(st)
+        if self._cache is not None and self._cache[0] == key:
+            raw, creds = self._cache[1], self._cache[2]
+            if creds is None:
+                creds = _json_loads(raw)
+                self._cache = (key, raw, creds)
+            return raw, creds
+        raw, creds = self._read_parsed()
+        self._cache = (key, raw, creds)
+        return raw, creds
+    
+    def _fresh_credentials(self) -> Dict:
+        """
+        Return a newly parsed credentials dict that callers may modify.
+        
+        Reuses the cached bytes when the file is unchanged, but always parses
+        them into a new dict so caller edits can never reach the cache.
+        
+        Raises:
+            Same as _load_cached.
+        """
+        st = self._regular_stat()
+        key = self._cache_key(st)
+        if self._cache is not None and self._cache[0] == key:
+            return _json_loads(self._cache[1])
+        raw, creds = self._read_parsed()
+        self._cache = (key, raw, None)
+        return creds
+    
+    def _matches_on_disk(self, data: bytes, st: os.stat_result) -> bool:
+        """
+        Check whether the file described by st already contains data.
+        
+        A size mismatch is decided from the stat alone; otherwise the cached
+        bytes are compared, reading the file only on a cache miss.
+        """
+        if st.st_size != len(data):
+            return False
+        if self._cache is not None and self._cache[0] == self._cache_key(st):
+            return self._cache[1] == data
+        return self.creds_path.read_bytes() == data
+    
+    def _read_error_message(self, error: Exception) -> str:
+        """Describe a failure raised by _regular_stat or _read_parsed."""
+        if isinstance(error, FileNotFoundError):
+            return f"Credentials file not found at {self.creds_path}"
+        if isinstance(error, (IsADirectoryError, _NotRegularFileError)):
+            return f"Path exists but is not a file: {self.creds_path}"
+        if isinstance(error, json.JSONDecodeError):
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            return f"Invalid JSON in credentials file {self.creds_path}: {error}"
+        return f"Error reading credentials at {self.creds_path}: {error}"
     
     def validate_credentials(self) -> Tuple[bool, str]:
         """
@@ -51,27 +323,17 @@ class CredentialManager:
         Returns:
             Tuple of (success: bool, message: str)
         """
-        if not self.creds_path.exists():
-            msg = f"Credentials file not found at {self.creds_path}"
-            logger.warning(msg)
-            return False, msg
-        
-        if not self.creds_path.is_file():
-            msg = f"Path exists but is not a file: {self.creds_path}"
-            logger.error(msg)
-            return False, msg
-        
         try:
-            # Verify file is readable and contains valid JSON
-            with open(self.creds_path, 'r') as f:
-                json.load(f)
+            # Verify file is readable and contains valid JSON; missing files
+            # and non-files are reported from a single stat
+            self._load_cached()
             return True, "Credentials file is valid"
-        except json.JSONDecodeError as e:
-            msg = f"Invalid JSON in credentials file: {e}"
-            logger.error(msg)
+        except FileNotFoundError as e:
+            msg = self._read_error_message(e)
+            logger.warning(msg)
             return False, msg
         except Exception as e:
-            msg = f"Error reading credentials: {e}"
+            msg = self._read_error_message(e)
             logger.error(msg)
             return False, msg
     
@@ -79,78 +341,314 @@ class CredentialManager:
         """
         Load credentials from file.
         
+        Each call returns a new dictionary, so it is safe to modify.
+        
         Returns:
             Credentials dictionary or None if loading fails.
         """
         try:
-            with open(self.creds_path, 'r') as f:
-                creds = json.load(f)
-            logger.info("Successfully loaded credentials")
+            creds = self._fresh_credentials()
+            logger.debug("Successfully loaded credentials")
             return creds
         except Exception as e:
-            logger.error(f"Failed to load credentials: {e}")
+            logger.error(f"Failed to load credentials from {self.creds_path}: {e}")
             return None
     
-    def save_credentials(self, creds: Dict, create_backup: bool = True) -> bool:
+    def save_credentials(
+        self,
+        creds: Dict,
+        create_backup: bool = True,
+        ensure_parent: bool = True,
+        pretty: bool = False,
+    ) -> bool:
         """
         Save credentials to file.
         
         Args:
             creds: Credentials dictionary to save.
             create_backup: Whether to create a backup of existing file.
+            ensure_parent: Whether to create the parent directory. Callers
+                that have just read the file can skip this check.
+            pretty: Whether to indent the JSON for human inspection. Compact
+                output is written by default.
         
         Returns:
             True if successful, False otherwise.
         """
+        self.last_backup = None
         try:
-            # Create backup if requested and file exists
-            if create_backup and self.creds_path.exists():
-                backup_path = self.creds_path.with_suffix(self.creds_path.suffix + BACKUP_SUFFIX)
-                import shutil
-                shutil.copy2(self.creds_path, backup_path)
-                logger.info(f"Created backup at {backup_path}")
+            data = _json_dumps(creds, pretty=pretty)
+            
+            # Write through a symlinked creds.json to its real target, as a
+            # plain open('w') would, instead of replacing the link itself
+            target = Path(os.path.realpath(self.creds_path))
             
             # Ensure parent directory exists
-            self.creds_path.parent.mkdir(parents=True, exist_ok=True)
+            if ensure_parent:
+                _ensured_parent(target)
+            
+            st = self._stat()
+            if st is not None and not stat.S_ISREG(st.st_mode):
+                raise _NotRegularFileError(
+                    errno.EISDIR, "Not a regular file", str(self.creds_path)
+                )
             
-            # Write credentials
-            with open(self.creds_path, 'w') as f:
-                json.dump(creds, f, indent=2)
+            # Skip the backup, write and fsync when nothing would change
+            if st is not None and self._matches_on_disk(data, st):
+                logger.debug("Credentials unchanged - skipping write (no-op)")
+                return True
+            current_mode = stat.S_IMODE(st.st_mode) if st is not None else None
             
-            logger.info("Successfully saved credentials")
+            try:
+                backup_path = self._replace_contents(target, data, current_mode, create_backup)
+            except FileNotFoundError:
+                if not ensure_parent:
+                    raise
+                # The directory was removed after it was first created
+                _ensured_parent.cache_clear()
+                _ensured_parent(target)
+                backup_path = self._replace_contents(target, data, current_mode, create_backup)
+            self.last_backup = backup_path
+            
+            # Cache only the bytes: the caller may keep modifying creds
+            self._cache = (self._cache_key(), data, None)
+            
+            logger.debug("Successfully saved credentials")
             return True
         except Exception as e:
-            logger.error(f"Failed to save credentials: {e}")
+            logger.error(f"Failed to save credentials to {self.creds_path}: {e}")
+            self._cache = None
             return False
     
-    def check_registration_status(self, creds: Dict) -> Dict[str, bool]:
+    def _replace_contents(
+        self,
+        target: Path,
+        data: bytes,
+        current_mode: Optional[int],
+        create_backup: bool,
+    ) -> Optional[Path]:
+        """
+        Atomically and durably replace target with data.
+        
+        Args:
+            target: Resolved credentials path to replace.
+            data: Serialized credentials.
+            current_mode: Mode of the existing file, or None if there is none.
+            create_backup: Whether to keep the existing file as a backup.
+        
+        Returns:
+            Path of the backup, or None if none was made.
+        
+        Raises:
+            OSError: If any step fails; the temp file is removed.
+        """
+        # Write to a sibling temp file so a crash never leaves a
+        # truncated creds.json behind. mkstemp creates it exclusively
+        # (O_EXCL) under a unique name with mode 0600, and the final mode
+        # is applied before any key material is written.
+        fd, tmp_name = tempfile.mkstemp(
+            dir=target.parent,
+            prefix=f".{target.name}.",
+            suffix=TMP_SUFFIX,
+        )
+        try:
+            with os.fdopen(fd, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                if current_mode is not None:
+                    os.fchmod(f.fileno(), current_mode)
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            
+            # Create backup if requested and file exists. Hardlinking keeps
+            # the old inode alive under the backup name without copying data.
+            backup_path = None
+            if create_backup and current_mode is not None:
+                backup_path = target.with_suffix(target.suffix + BACKUP_SUFFIX)
+                try:
+                    os.unlink(backup_path)
+                except FileNotFoundError:
+                    pass
+                try:
+                    os.link(target, backup_path)
+                except OSError:
+                    # Filesystem without hardlink support
+                    os.replace(target, backup_path)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Created backup at {backup_path}")
+            
+            # Atomically swap in the new credentials
+            os.replace(tmp_name, target)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        
+        # Make the rename itself durable
+        _fsync_dir(target.parent)
+        return backup_path
+    
+    def _peek_status(self, st: Optional[os.stat_result] = None) -> Dict:
+        """
+        Read only the top-level keys needed for the registration status.
+        
+        Streams the file with ijson and builds only the values of
+        STATUS_KEYS, so peak memory is bounded by the parser state instead
+        of the whole document. The stream is read to the end so that, like
+        json.loads, the last of any duplicate keys wins and a corrupt tail
+        is still rejected. Falls back to the cached full parse when ijson is
+        not installed, the cache is already warm, the document is not an
+        object, or the stream is not valid JSON (so the usual decode error
+        is raised).
+        
+        Args:
+            st: Stat already taken by the caller via _regular_stat.
+        
+        Returns:
+            Dictionary holding whichever of STATUS_KEYS are present.
+        
+        Raises:
+            Same as _load_cached.
+        """
+        if st is None:
+            st = self._regular_stat()
+        if ijson is None:
+            return self._load_cached(st)[1]
+        if self._cache is not None and self._cache[0] == self._cache_key(st):
+            return self._load_cached(st)[1]
+        
+        found = {}
+        try:
+            with open(self.creds_path, 'rb') as f:
+                events = ijson.parse(f)
+                _, event, _ = next(events)
+                if event != 'start_map':
+                    # Arrays and scalars get the same verdict as json.loads
+                    return self._load_cached(st)[1]
+                
+                # Nesting depth is tracked from container events; prefixes
+                # cannot tell a top-level key "" from the top level itself
+                depth = 1
+                key = None
+                builder = None
+                for _, event, value in events:
+                    if depth == 1 and event == 'map_key':
+                        key = value
+                        builder = ijson.ObjectBuilder() if value in STATUS_KEYS else None
+                        continue
+                    if depth == 1 and event == 'end_map':
+                        depth = 0
+                        continue
+                    
+                    # Part of the value of the current top-level key
+                    if builder is not None:
+                        builder.event(event, value)
+                    if event in ('start_map', 'start_array'):
+                        depth += 1
+                    elif event in ('end_map', 'end_array'):
+                        depth -= 1
+                    if depth == 1 and builder is not None:
+                        found[key] = builder.value
+                        builder = None
+        except (ijson.JSONError, StopIteration):
+            return self._load_cached(st)[1]
+        return found
+    
+    def check_registration_status(self, creds: Optional[Dict] = None) -> RegistrationStatus:
         """
         Check the registration status indicators in credentials.
         
         Args:
-            creds: Credentials dictionary.
+            creds: Credentials dictionary. When omitted, only the status keys
+                are streamed from the file.
         
         Returns:
-            Dictionary with status indicators.
+            RegistrationStatus with the status indicators.
+        
+        Raises:
+            _NotAnObjectError: If the credentials are not a JSON object.
+            Same as _load_cached, when creds is omitted.
         """
+        if creds is None:
+            creds = self._peek_status()
+        if not isinstance(creds, dict):
+            raise _NotAnObjectError(
+                f"Credentials in {self.creds_path} are a JSON "
+                f"{type(creds).__name__}, not an object"
+            )
+        
+        me = creds.get("me")
         has_account = bool(creds.get("account"))
-        has_me = bool(creds.get("me", {}).get("id"))
-        registered = creds.get("registered", False)
-        
-        status = {
-            "has_account": has_account,
-            "has_me": has_me,
-            "registered": registered,
-            "needs_fix": has_account and has_me and not registered
-        }
+        has_me = isinstance(me, dict) and bool(me.get("id"))
+        registered = bool(creds.get("registered", False))
         
-        logger.info(
-            f"Registration status: account={has_account}, "
-            f"me={has_me}, registered={registered}"
+        status = RegistrationStatus(
+            has_account,
+            has_me,
+            registered,
+            has_account & has_me & (not registered),
         )
         
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Registration status: account={has_account}, "
+                f"me={has_me}, registered={registered}"
+            )
+        
         return status
     
+    def _probe_registered(self) -> bool:
+        """
+        Cheaply check whether the file already says registered=true.
+        
+        Scans the memory-mapped file for the raw flag bytes without parsing
+        it. The match is only conclusive when it is unambiguous: it is the
+        sole "registered" key in the file, it sits directly inside the
+        top-level object, and the file is a single object with balanced
+        brackets (which rules out truncated files). Any other outcome,
+        including read errors, returns False so the caller falls back to
+        the full status check.
+        
+        Returns:
+            True if the flag is definitely set, False if unknown.
+        """
+        try:
+            fd = os.open(self.creds_path, os.O_RDONLY)
+        except OSError:
+            return False
+        try:
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty files and non-regular files cannot be mapped
+            os.close(fd)
+            return False
+        try:
+            pos = -1
+            for pattern in REGISTERED_TRUE_PATTERNS:
+                pos = mm.find(pattern)
+                if pos != -1:
+                    break
+            if pos == -1:
+                return False
+            # Duplicate keys are resolved by the parser, not by us
+            if mm.find(REGISTERED_KEY) != pos or mm.find(REGISTERED_KEY, pos + 1) != -1:
+                return False
+            
+            head, tail = mm[:pos], mm[pos:]
+            if not head.lstrip().startswith(b'{') or not tail.rstrip().endswith(b'}'):
+                return False
+            # Nesting depth at the match must be exactly the top-level object
+            if head.count(b'{') + head.count(b'[') - head.count(b'}') - head.count(b']') != 1:
+                return False
+            return (
+                head.count(b'{') + tail.count(b'{') == head.count(b'}') + tail.count(b'}')
+                and head.count(b'[') + tail.count(b'[') == head.count(b']') + tail.count(b']')
+            )
+        finally:
+            mm.close()
+            os.close(fd)
+    
     def fix_registration_flag(self) -> bool:
         """
         Fix the registration flag if needed.
@@ -158,63 +656,184 @@ class CredentialManager:
         Returns:
             True if fix was applied or not needed, False on error.
         """
-        # Validate credentials exist
-        valid, msg = self.validate_credentials()
-        if not valid:
-            logger.error(f"Cannot fix credentials: {msg}")
+        try:
+            # One stat serves the type check, the cache lookups and the read
+            st = self._regular_stat()
+            
+            # Fast path: skip parsing when the flag is already set
+            if self._probe_registered():
+                logger.debug("No fix needed - credentials are already correct")
+                self.last_action = "none"
+                return True
+            
+            # Check status from the streamed top-level keys
+            status = self.check_registration_status(self._peek_status(st))
+            if not status.needs_fix:
+                logger.debug("No fix needed - credentials are already correct")
+                self.last_action = "none"
+                return True
+            
+            # Materialize (and fully validate) the document only for a write
+            _, creds = self._load_cached(st)
+        except _NotAnObjectError as e:
+            logger.error(f"Cannot fix credentials: {e}")
+            self.last_action = "error"
             return False
-        
-        # Load credentials
-        creds = self.load_credentials()
-        if creds is None:
+        except Exception as e:
+            logger.error(f"Cannot fix credentials: {self._read_error_message(e)}")
+            self.last_action = "error"
             return False
         
-        # Check status
-        status = self.check_registration_status(creds)
-        
-        if not status["needs_fix"]:
-            logger.info("No fix needed - credentials are already correct")
-            return True
-        
         # Apply fix
-        logger.warning("Detected registered=false bug - applying fix")
+        logger.warning(f"Detected registered=false bug in {self.creds_path} - applying fix")
+        # Copy so a failed save does not leave the cached dict modified
+        creds = dict(creds)
         creds["registered"] = True
         
         # Save updated credentials
-        if self.save_credentials(creds, create_backup=True):
-            logger.info("Successfully fixed registration flag: false -> true")
+        if self.save_credentials(creds, create_backup=True, ensure_parent=False):
+            logger.debug("Successfully fixed registration flag: false -> true")
+            self.last_action = "fixed"
             return True
         else:
-            logger.error("Failed to save fixed credentials")
+            logger.error(f"Failed to save fixed credentials to {self.creds_path}")
+            self.last_action = "error"
             return False
 
 
+def fix_all(
+    root: Path,
+    workers: int = 8,
+    actions: Optional[Dict[Path, Optional[str]]] = None,
+) -> Dict[Path, bool]:
+    """
+    Fix the registration flag for every session under a directory.
+    
+    The work is I/O-bound, so sessions are checked concurrently on a thread
+    pool.
+    
+    Args:
+        root: Directory searched recursively for creds.json files.
+        workers: Maximum number of worker threads.
+        actions: Optional mapping filled with each session's last_action
+            ("none", "fixed" or "error").
+    
+    Returns:
+        Mapping of each credentials path to its fix_registration_flag result,
+        ordered by path.
+    """
+    paths = sorted(root.glob(f"**/{CREDS_FILENAME}"))
+    results = {path: False for path in paths}
+    if actions is not None:
+        actions.update((path, "error") for path in paths)
+    if not paths:
+        return results
+    
+    managers = {path: CredentialManager(path) for path in paths}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(manager.fix_registration_flag): path
+            for path, manager in managers.items()
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                results[path] = future.result()
+            except Exception as e:
+                logger.error(f"Unexpected error fixing {path}: {e}")
+                continue
+            if actions is not None:
+                actions[path] = managers[path].last_action
+    
+    return results
+
+
+def _configure_logging() -> None:
+    """Configure root logging for command-line use."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(asctime)s] %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+
+def _run_all(root: Path) -> None:
+    """Run fix_all over root, log one summary record and exit."""
+    try:
+        actions: Dict[Path, Optional[str]] = {}
+        results = fix_all(root, actions=actions)
+    except KeyboardInterrupt:
+        logger.info("Operation cancelled by user")
+        sys.exit(130)
+    
+    if not results:
+        logger.warning(f"No {CREDS_FILENAME} files found under {root}")
+    failed = [str(path) for path, ok in results.items() if not ok]
+    fixed = sum(1 for action in actions.values() if action == "fixed")
+    success = bool(results) and not failed
+    record = json.dumps({
+        "path": str(root),
+        "status": "success" if success else "failure",
+        "action": "fix_all",
+        "sessions": len(results),
+        "fixed": fixed,
+        "failed": len(failed),
+        "failed_paths": failed,
+    })
+    if success:
+        logger.info("recovery %s", record)
+        sys.exit(0)
+    else:
+        logger.error("recovery %s", record)
+        sys.exit(1)
+
+
 def main():
     """
     Main entry point for the credential recovery utility.
     """
-    logger.info("="*60)
-    logger.info("WhatsAppBot Core - Credential Recovery Utility")
-    logger.info("="*60)
+    _configure_logging()
     
-    # Allow custom path from command line argument
-    creds_path = None
-    if len(sys.argv) > 1:
-        creds_path = Path(sys.argv[1])
-        logger.info(f"Using custom credentials path: {creds_path}")
+    parser = argparse.ArgumentParser(
+        description="WhatsAppBot Core - Credential Recovery Utility"
+    )
+    parser.add_argument(
+        "path",
+        nargs="?",
+        type=Path,
+        help="Credentials file, or sessions directory with --all",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Fix every creds.json found under the sessions directory",
+    )
+    args = parser.parse_args()
+    
+    if args.all:
+        _run_all(args.path or DEFAULT_SESSIONS_ROOT)
     
     # Initialize manager
-    manager = CredentialManager(creds_path)
+    manager = CredentialManager(args.path)
     
     # Attempt to fix credentials
     try:
         success = manager.fix_registration_flag()
         
+        # One structured record per run instead of a banner and status lines
+        summary = {
+            "path": str(manager.creds_path),
+            "status": "success" if success else "failure",
+            "action": manager.last_action,
+        }
+        if manager.last_action == "fixed" and manager.last_backup is not None:
+            summary["backup"] = str(manager.last_backup)
+        record = json.dumps(summary)
         if success:
-            logger.info("✓ Credential recovery completed successfully")
+            logger.info("recovery %s", record)
             sys.exit(0)
         else:
-            logger.error("✗ Credential recovery failed")
+            logger.error("recovery %s", record)
             sys.exit(1)
     
     except KeyboardInterrupt:
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# fix_whatsapp_registered.py lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
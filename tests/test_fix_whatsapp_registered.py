@@ -0,0 +1,242 @@
+"""Tests for the credential recovery utility."""
+
+import json
+
+import pytest
+
+import fix_whatsapp_registered as fwr
+
+
+def write_creds(path, creds):
+    path.write_text(json.dumps(creds))
+    return path
+
+
+@pytest.fixture
+def unregistered():
+    return {"account": {"details": "x"}, "me": {"id": "1@s.whatsapp.net"}, "registered": False}
+
+
+@pytest.fixture
+def creds_path(tmp_path, unregistered):
+    return write_creds(tmp_path / "creds.json", unregistered)
+
+
+def read_json(path):
+    return json.loads(path.read_text())
+
+
+@pytest.fixture(params=["stdlib", "ijson"])
+def status_backend(request, monkeypatch):
+    """Run a test with and without the ijson status peek."""
+    if request.param == "ijson":
+        if fwr.ijson is None:
+            pytest.skip("ijson not installed")
+    else:
+        monkeypatch.setattr(fwr, "ijson", None)
+    return request.param
+
+
+def test_editing_loaded_dict_does_not_reach_cache(creds_path):
+    manager = fwr.CredentialManager(creds_path)
+    creds = manager.load_credentials()
+    creds["registered"] = True
+    
+    assert manager.load_credentials()["registered"] is False
+    assert manager.fix_registration_flag() is True
+    assert manager.last_action == "fixed"
+    assert read_json(creds_path)["registered"] is True
+
+
+@pytest.mark.parametrize("raw", [
+    b'{"n":123456789012345678901234567890}',
+    b'{"n":-9223372036854775809}',
+    b'{"n":NaN,"m":null}',
+    b'{"n":18446744073709551615,"s":"12345678901234567890123"}',
+])
+def test_json_round_trip_matches_stdlib(raw):
+    creds = fwr._json_loads(raw)
+    
+    assert repr(creds) == repr(json.loads(raw))
+    assert repr(json.loads(fwr._json_dumps(creds))) == repr(json.loads(raw))
+
+
+def test_fix_keeps_wide_integers(tmp_path, unregistered):
+    path = tmp_path / "creds.json"
+    path.write_text(json.dumps(unregistered)[:-1] + ', "n": 123456789012345678901234567890}')
+    
+    assert fwr.CredentialManager(path).fix_registration_flag() is True
+    assert read_json(path)["n"] == 123456789012345678901234567890
+
+
+def test_fix_all_reports_per_session_results(tmp_path, unregistered):
+    for name in ("a", "b", "c"):
+        (tmp_path / name).mkdir()
+        write_creds(tmp_path / name / "creds.json", unregistered)
+    (tmp_path / "c" / "creds.json").write_text("{")
+    
+    actions = {}
+    results = fwr.fix_all(tmp_path, workers=2, actions=actions)
+    
+    assert results == {
+        tmp_path / "a" / "creds.json": True,
+        tmp_path / "b" / "creds.json": True,
+        tmp_path / "c" / "creds.json": False,
+    }
+    assert sorted(actions.values()) == ["error", "fixed", "fixed"]
+
+
+@pytest.mark.parametrize("raw, needs_fix", [
+    (b'{"account":{"a":1},"me":{"id":"x"},"registered":false,"":{"registered":true}}', True),
+    (b'{"account":{"a":[1,{"b":2}]},"me":{"id":"x"},"registered":true,"registered":false}', True),
+    (b'{"account":{"a":1},"me":{"id":"x"},"big":[1,[2,{"registered":true}]],"registered":false}', True),
+    (b'{"me":{"id":"x"},"account":"a","registered":true}', False),
+    (b'{"account":{},"me":{"id":"x"},"registered":false}', False),
+])
+def test_peek_status_matches_full_parse(tmp_path, status_backend, raw, needs_fix):
+    path = tmp_path / "creds.json"
+    path.write_bytes(raw)
+    manager = fwr.CredentialManager(path)
+    
+    assert manager.check_registration_status().needs_fix is needs_fix
+    assert manager.check_registration_status(json.loads(raw)).needs_fix is needs_fix
+
+
+def test_fix_rejects_non_object_document(tmp_path, status_backend, caplog):
+    path = tmp_path / "creds.json"
+    path.write_text("[1, 2]")
+    manager = fwr.CredentialManager(path)
+    
+    assert manager.fix_registration_flag() is False
+    assert manager.last_action == "error"
+    assert "not an object" in caplog.text
+    assert "Error reading credentials" not in caplog.text
+
+
+@pytest.mark.parametrize("me", [None, "1@s.whatsapp.net", []])
+def test_non_object_me_has_no_id(tmp_path, me):
+    path = write_creds(tmp_path / "creds.json", {"account": {"a": 1}, "me": me, "registered": False})
+    manager = fwr.CredentialManager(path)
+    
+    assert manager.check_registration_status().has_me is False
+    assert manager.fix_registration_flag() is True
+    assert manager.last_action == "none"
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (b'{"account":1,"me":{"id":"x"},"registered":true}', True),
+    (b'{\n  "account": 1,\n  "registered": true,\n  "k": [1, [2]]\n}\n', True),
+    (b'{"account":{"a":1,"registered":true},"me":{"id":"x"}}', False),
+    (b'{"registered":true,"registered":false}', False),
+    (b'{"registered":true, "account": {', False),
+    (b'{"registered":true,"k":[1}', False),
+    (b'[{"registered":true}]', False),
+    (b'', False),
+])
+def test_probe_only_trusts_unambiguous_top_level_flag(tmp_path, raw, expected):
+    path = tmp_path / "creds.json"
+    path.write_bytes(raw)
+    
+    assert fwr.CredentialManager(path)._probe_registered() is expected
+
+
+@pytest.mark.parametrize("raw", [
+    b'{"account":{"a":1,"registered":true},"me":{"id":"x"}}',
+    b'{"account":{"a":1},"me":{"id":"x"},"registered":true,"registered":false}',
+    b'{"account":{"a":1},"me":{"id":"x"},"registered":false,"":{"registered":true}}',
+])
+def test_fix_applies_when_flag_is_ambiguous(tmp_path, status_backend, raw):
+    path = tmp_path / "creds.json"
+    path.write_bytes(raw)
+    manager = fwr.CredentialManager(path)
+    
+    assert manager.fix_registration_flag() is True
+    assert manager.last_action == "fixed"
+    assert read_json(path)["registered"] is True
+
+
+@pytest.mark.parametrize("raw", [
+    b'{"account":{"a":1},"me":{"id":"x"},"registered":true, "k": {',
+    b'{"registered":true',
+])
+def test_fix_rejects_truncated_file(tmp_path, status_backend, raw):
+    path = tmp_path / "creds.json"
+    path.write_bytes(raw)
+    manager = fwr.CredentialManager(path)
+    
+    assert manager.fix_registration_flag() is False
+    assert manager.last_action == "error"
+    assert path.read_bytes() == raw
+
+
+def test_fix_writes_backup_and_no_temp_files(creds_path, unregistered):
+    original = creds_path.read_bytes()
+    manager = fwr.CredentialManager(creds_path)
+    
+    assert manager.fix_registration_flag() is True
+    backup = creds_path.with_name("creds.json.backup")
+    assert manager.last_backup == backup
+    assert backup.read_bytes() == original
+    assert read_json(creds_path) == dict(unregistered, registered=True)
+    assert sorted(p.name for p in creds_path.parent.iterdir()) == ["creds.json", "creds.json.backup"]
+
+
+def test_save_keeps_file_mode(creds_path):
+    creds_path.chmod(0o600)
+    
+    assert fwr.CredentialManager(creds_path).save_credentials({"a": 1}) is True
+    assert creds_path.stat().st_mode & 0o777 == 0o600
+
+
+def test_fix_writes_through_symlink(tmp_path, unregistered):
+    target = write_creds(tmp_path / "real.json", unregistered)
+    link = tmp_path / "creds.json"
+    link.symlink_to(target)
+    
+    assert fwr.CredentialManager(link).fix_registration_flag() is True
+    assert link.is_symlink()
+    assert read_json(target)["registered"] is True
+
+
+def test_directory_at_path_is_rejected(tmp_path):
+    path = tmp_path / "creds.json"
+    path.mkdir()
+    manager = fwr.CredentialManager(path)
+    
+    assert manager.validate_credentials() == (False, f"Path exists but is not a file: {path}")
+    assert manager.fix_registration_flag() is False
+    assert manager.save_credentials({"a": 1}) is False
+    assert path.is_dir()
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_unchanged_save_is_noop(creds_path):
+    manager = fwr.CredentialManager(creds_path)
+    creds = manager.load_credentials()
+    assert manager.save_credentials(creds) is True
+    inode = creds_path.stat().st_ino
+    
+    assert manager.save_credentials(creds) is True
+    assert creds_path.stat().st_ino == inode
+    assert manager.last_backup is None
+
+
+def test_save_recreates_removed_directory(tmp_path):
+    path = tmp_path / "session" / "creds.json"
+    manager = fwr.CredentialManager(path)
+    assert manager.save_credentials({"a": 1}) is True
+    
+    path.unlink()
+    path.parent.rmdir()
+    assert manager.save_credentials({"a": 2}) is True
+    assert read_json(path) == {"a": 2}
+
+
+def test_external_rewrite_is_detected(creds_path, unregistered):
+    manager = fwr.CredentialManager(creds_path)
+    assert manager.load_credentials()["registered"] is False
+    
+    write_creds(creds_path, dict(unregistered, registered=True, extra=1))
+    assert manager.load_credentials() == dict(unregistered, registered=True, extra=1)
+    assert manager.fix_registration_flag() is True
+    assert manager.last_action == "none"